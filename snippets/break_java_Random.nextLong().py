@@ -1,53 +1,64 @@
+import functools
+
 import z3 as z
 
 
-def make_constraints_next(n_constraints: int, slope: int = 0x5DEECE66D, intercept: int = 0xB, gen_bits=31):
-    # Define some constants
+@functools.lru_cache()
+def lcg_constants(slope: int, intercept: int):
+    # The Z3 constants only depend on the parameters of the generator, so we build them once per parameter set
     addend = z.BitVecVal(intercept, 64)
     multiplier = z.BitVecVal(slope, 64)
     mask = z.BitVecVal((1 << 48) - 1, 64)
+    return addend, multiplier, mask
 
-    # Define symbolic variables for the seed variable
-    seeds = {f'seed_{i}': z.BitVec(f'seed_{i}', 64) for i in range(n_constraints)}
 
-    constraints = []
+def make_constraints_next(n_constraints: int, slope: int = 0x5DEECE66D, intercept: int = 0xB, gen_bits=31,
+                          initial_seed=None):
+    # Define some constants
+    addend, multiplier, mask = lcg_constants(slope, intercept)
+
+    # Define symbolic variables for the seed variable
+    # Notice: if initial_seed is given, we use it as seed_0 instead of a new symbolic variable
+    if initial_seed is None:
+        initial_seed = z.BitVec('seed_0', 64)
+    seeds = [initial_seed] + [z.BitVec(f'seed_{i}', 64) for i in range(1, n_constraints)]
 
     # Build constraints for the relation in row 175
-    for i in range(1, n_constraints):
-        constraints.append(seeds[f'seed_{i}'] == z.simplify((seeds[f'seed_{i - 1}'] * multiplier + addend) & mask))
+    seed_eqs = [seeds[i] == (seeds[i - 1] * multiplier + addend) & mask
+                for i in range(1, n_constraints)]
 
     # Define symbolic variables for the output from next()
-    next_outputs = {f'next_output_{i}': z.BitVec(f'output{i}', 32) for i in range(1, n_constraints)}
+    # Notice: next_outputs[i - 1] holds the output generated from seed_i
+    next_outputs = [z.BitVec(f'output{i}', 32) for i in range(1, n_constraints)]
 
     # Build the constraints for the relation in row 176
-    for i in range(1, n_constraints):
-        constraints.append(
-            next_outputs[f'next_output_{i}'] == z.simplify(z.Extract(31, 0, z.LShR(seeds[f'seed_{i}'], 48 - gen_bits))))
+    # Notice: seed >>> (48 - bits) keeps bits 47 to 48 - gen_bits of the seed, so we extract them directly
+    # and zero extend the result when gen_bits is smaller than 32
+    out_eqs = [next_outputs[i - 1] == z.ZeroExt(32 - gen_bits, z.Extract(47, 48 - gen_bits, seeds[i]))
+               for i in range(1, n_constraints)]
 
-    return constraints, seeds, next_outputs
+    return seed_eqs + out_eqs, seeds, next_outputs
 
 
 def find_seed(sequence_length: int, slope: int = 0x5DEECE66D, intercept: int = 0xB):
     # Define some constants
-    addend = z.BitVecVal(intercept, 64)
-    multiplier = z.BitVecVal(slope, 64)
-    mask = z.BitVecVal((1 << 48) - 1, 64)
-
-    # Note we're generating an extra constraint
-    # This is required since we'll be using seed_0 to extract the Random() instantiation value
-    next_constraints, seeds, next_outputs = make_constraints_next(n_constraints=sequence_length + 1, gen_bits=32)
+    addend, multiplier, mask = lcg_constants(slope, intercept)
 
     # Define a symbolic variable that we'll use to get the value that instantiated Random()
     original_seed = z.BitVec('original_seed', 64)
 
-    # Build a solver object
-    s = z.Solver()
+    # Note we're generating an extra constraint
+    # This is required since we'll be using seed_0 to extract the Random() instantiation value
+    # seed_0 is expressed directly in terms of the value used to instantiate Random()
+    next_constraints, seeds, next_outputs = make_constraints_next(n_constraints=sequence_length + 1, gen_bits=32,
+                                                                  initial_seed=(original_seed ^ multiplier) & mask)
 
-    # Build a constraint that relates seed_0 and the value used to instantiate Random()
-    s.add(seeds[f'seed_0'] == (original_seed ^ multiplier) & mask)
+    # Build a solver object
+    # Notice: the problem is pure bit-vector logic, so we use the qfbv tactic directly instead of the default solver
+    s = z.Tactic('qfbv').solver()
 
     # Next let's add the constraints we've built for next()
-    s.add(next_constraints)
+    s.add(*next_constraints)
 
     # Lastly, let's return all the objects we've constructed so far
     return s, original_seed, seeds, next_outputs
@@ -55,41 +66,38 @@ def find_seed(sequence_length: int, slope: int = 0x5DEECE66D, intercept: int = 0
 
 def find_seed_nextLong(sequence_length: int, slope: int = 0x5DEECE66D, intercept: int = 0xB):
     # Define some constants
-    addend = z.BitVecVal(intercept, 64)
-    multiplier = z.BitVecVal(slope, 64)
-    mask = z.BitVecVal((1 << 48) - 1, 64)
+    addend, multiplier, mask = lcg_constants(slope, intercept)
+
+    # Define a symbolic variable that we'll use to get the value that instantiated Random()
+    original_seed = z.BitVec('original_seed', 64)
 
     # Note we're generating double the constraints in the sequence_length + 1
     # This is required since we'll be using seed_0 to extract the Random() instantiation value
     # Furthermore, each nextLong call consumes two outputs from next()
-    next_constraints, seeds, next_outputs = make_constraints_next(n_constraints=2 * sequence_length + 1, gen_bits=32)
-
-    # Define a symbolic variable that we'll use to get the value that instantiated Random()
-    original_seed = z.BitVec('original_seed', 64)
+    # seed_0 is expressed directly in terms of the value used to instantiate Random()
+    next_constraints, seeds, next_outputs = make_constraints_next(n_constraints=2 * sequence_length + 1, gen_bits=32,
+                                                                  initial_seed=(original_seed ^ multiplier) & mask)
 
     # Build a solver object
-    s = z.Solver()
-
-    # Build a constraint that relates seed_0 and the value used to instantiate Random()
-    s.add(seeds[f'seed_0'] == (original_seed ^ multiplier) & mask)
+    # Notice: the problem is pure bit-vector logic, so we use the qfbv tactic directly instead of the default solver
+    s = z.Tactic('qfbv').solver()
 
     # Next let's add the constraints we've built for next()
-    s.add(next_constraints)
+    s.add(*next_constraints)
 
     # Define symbolic variables for the output from nextLong
-    # Notice: we're using a symbolic variable of type Int
-    # Since nextLong does a sum on ints, it's easier to model this using Z3 arithmetic models
-    # This differs from previous examples where we used BitVec objects exclusively
-    # Consequently, we'll be using the conversion method BV2Int that takes a BitVec object and turns it into an Int object
-    nextLong_outputs = {f'nextLong_output_{i}': z.Int(f'nextLong_output_{i}') for i in range(1, sequence_length + 1)}
+    # Notice: nextLong returns a long, so we're using 64 bit BitVec objects
+    # Keeping everything as BitVec objects keeps the problem in pure bit-vector logic, which Z3 solves much faster
+    # than a mix of bit-vectors and integer arithmetic
+    nextLong_outputs = [z.BitVec(f'nextLong_output_{i}', 64) for i in range(1, sequence_length + 1)]
 
     # Finally, let's add the constraints for nextLong
-    for i, j in zip(range(1, sequence_length + 1), range(1, sequence_length * 2 + 1, 2)):
-        # Notice: we've replaced the bit shift operator in the source with an enquivalent multiplication
-        # Z3 doesn't support bit shift operations on Int objects
-        first_next = z.BV2Int(next_outputs[f'next_output_{j}'], is_signed=True) * 2 ** 32
-        second_next = z.BV2Int(next_outputs[f'next_output_{j + 1}'], is_signed=True)
-        s.add(nextLong_outputs[f'nextLong_output_{i}'] == first_next + second_next)
+    for i, j in zip(range(sequence_length), range(0, sequence_length * 2, 2)):
+        # Notice: the first output is shifted into the upper 32 bits by concatenating it with 32 zero bits
+        # The second output is an int, so Java sign extends it to a long before the addition
+        first_next = z.Concat(next_outputs[j], z.BitVecVal(0, 32))
+        second_next = z.SignExt(32, next_outputs[j + 1])
+        s.add(nextLong_outputs[i] == first_next + second_next)
 
     # Lastly, let's return all the objects we've constructed so far
     return s, original_seed, nextLong_outputs
@@ -101,16 +109,17 @@ if __name__ == '__main__':
     solver, original_seed, nextLong_outputs = find_seed_nextLong(sequence_length=len(known_longs))
 
     # As mentioned before, we should have enough information in one long to extract the instantiation value
-    solver.add(nextLong_outputs[f'nextLong_output_{1}'] == known_longs[0])
+    solver.add(nextLong_outputs[0] == known_longs[0])
 
     # Lets take a look at our constraints before trying to solve them
     print(solver)
 
     # Check if there is a solution
-    print(solver.check())
+    result = solver.check()
+    print(result)
 
     # Print the calculated seed if we found a solution
-    if solver.check() == z.sat:
+    if result == z.sat:
         print(solver.model()[original_seed])
     else:
         print("Didn't find a solution")
\ No newline at end of file
@@ -1,23 +1,42 @@
+import contextlib
+import io
+import os
+from multiprocessing import Pool
+
 import z3 as z
 
 
+def add_states(s, n_states: int) -> list:
+    # Define symbolic variables for the states and add the relation between consecutive states to the solver
+    # Notice: states[i - 1] holds state_i
+    states = [z.BitVec(f'state_{i}', 32) for i in range(1, n_states + 1)]
+
+    for i in range(1, n_states):
+        s.add(states[i] == states[i - 1] * 214013 + 2531011)
+
+    return states
+
+
+def rand_output(state):
+    # The number rand() % 100 returns for a given state
+    return z.URem((state >> 16) & 0x7FFF, 100)
+
+
 def break_rand(nums: list, next_num: int):
     n_nums = len(nums)
     # print(f'len nums: {n_nums}')
 
-    states = {f'state_{i}': z.BitVec(f'state_{i}', 32) for i in range(1, n_nums + 2)}
-    # print(states)
     output_next = z.BitVec('output_next', 32)
 
     s = z.Solver()
 
-    for i in range(2, n_nums + 2):
-        s.add(states[f'state_{i}'] == states[f'state_{i - 1}'] * 214013 + 2531011)
+    states = add_states(s, n_nums + 1)
+    # print(states)
 
-    for i in range(1, n_nums + 1):
-        s.add(z.URem((states[f'state_{i}'] >> 16) & 0x7FFF, 100) == nums[i - 1])
+    for i in range(n_nums):
+        s.add(rand_output(states[i]) == nums[i])
 
-    s.add(output_next == z.URem((states[f'state_{n_nums + 1}'] >> 16) & 0x7FFF, 100))
+    s.add(output_next == rand_output(states[n_nums]))
 
     # print(s)
 
@@ -30,8 +49,21 @@ def break_rand(nums: list, next_num: int):
     return s, states, output_next
 
 
+def break_rand_output(nums: list, next_num: int) -> str:
+    # Z3 objects can't be sent back from a worker process, so we return what break_rand printed instead
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        break_rand(nums, next_num)
+    return output.getvalue()
+
+
 if __name__ == '__main__':
     random_nums = [4, 54, 63, 79, 13, 55, 76, 11, 14, 45]
 
-    for i in range(3, 10):
-        break_rand(random_nums[:i], random_nums[i])
\ No newline at end of file
+    prefixes = [(random_nums[:i], random_nums[i]) for i in range(3, 10)]
+
+    # Every call builds its own independent solver, so we can solve them in parallel
+    # Notice: we're using processes rather than threads, since z3py's shared main context isn't thread safe
+    with Pool(processes=min(len(prefixes), os.cpu_count())) as p:
+        for output in p.starmap(break_rand_output, prefixes):
+            print(output, end='')
\ No newline at end of file
@@ -0,0 +1,73 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit
+def reproduces(seed: int, nums: np.ndarray) -> bool:
+    # Run the generator from the seed and check that it outputs nums
+    state = seed
+    for num in nums:
+        state = (state * 214013 + 2531011) & 0xFFFFFFFF
+        if ((state >> 16) & 0x7FFF) % 100 != num:
+            return False
+    return True
+
+
+@njit(parallel=True)
+def find_seeds(nums: np.ndarray) -> np.ndarray:
+    # The state of rand() is only 32 bits, so instead of asking Z3 we simply try every possible seed
+    # We split the seeds by their upper 16 bits, so every thread gets its own slice of the search space
+    # Notice: threads can't append to a shared list, so we first count the matching seeds in every slice,
+    # and then go over the slices that had matches again to write the seeds into their place in the result
+    counts = np.zeros(1 << 16, dtype=np.int64)
+    for high in prange(1 << 16):
+        for low in range(1 << 16):
+            if reproduces((high << 16) | low, nums):
+                counts[high] += 1
+
+    offsets = np.zeros((1 << 16) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    seeds = np.empty(offsets[-1], dtype=np.int64)
+
+    for high in prange(1 << 16):
+        if counts[high] == 0:
+            continue
+        position = offsets[high]
+        for low in range(1 << 16):
+            seed = (high << 16) | low
+            if reproduces(seed, nums):
+                seeds[position] = seed
+                position += 1
+
+    return seeds
+
+
+@njit
+def filter_seeds(seeds: np.ndarray, nums: np.ndarray) -> np.ndarray:
+    # Keep only the candidate seeds that still reproduce nums
+    keep = np.zeros(len(seeds), dtype=np.bool_)
+    for i in range(len(seeds)):
+        keep[i] = reproduces(seeds[i], nums)
+    return seeds[keep]
+
+
+def predict_next(seed: int, n_nums: int) -> int:
+    # Run the generator forward from the seed past the n_nums known outputs and return the next one
+    state = seed
+    for _ in range(n_nums + 1):
+        state = (state * 214013 + 2531011) & 0xFFFFFFFF
+    return ((state >> 16) & 0x7FFF) % 100
+
+
+if __name__ == '__main__':
+    random_nums = [4, 54, 63, 79, 13, 55, 76, 11, 14, 45]
+
+    # The seeds that reproduce a longer prefix are a subset of the seeds that reproduce a shorter one,
+    # so we only go over all the possible seeds once and then narrow down the candidates
+    seeds = find_seeds(np.array(random_nums[:3], dtype=np.int64))
+
+    for i in range(3, 10):
+        seeds = filter_seeds(seeds, np.array(random_nums[:i], dtype=np.int64))
+        predictions = {predict_next(int(seed), i) for seed in seeds}
+        print(f'For the sequence: {random_nums[:i]}, found {len(seeds)} candidate seeds')
+        print(f'We were expecting: {random_nums[i]} and got: {predictions}\n')
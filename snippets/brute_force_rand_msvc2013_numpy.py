@@ -0,0 +1,68 @@
+import numpy as np
+
+CHUNK = 1 << 20
+MULTIPLIER = np.uint32(214013)
+ADDEND = np.uint32(2531011)
+
+
+def find_seeds(nums: list) -> np.ndarray:
+    # Same search as brute_force_rand_msvc2013.py, for machines where Numba isn't available
+    # We go over the 2^32 possible seeds in chunks and run the generator on a whole chunk at once with NumPy
+    # Notice: uint32 arithmetic in NumPy wraps around just like the 32 bit state of rand()
+    offsets = np.arange(CHUNK, dtype=np.uint32)
+    candidates = []
+
+    # The first step works on whole chunks, so we do it in preallocated buffers instead of allocating new arrays
+    # for every chunk
+    states = np.empty(CHUNK, dtype=np.uint32)
+    outputs = np.empty(CHUNK, dtype=np.uint32)
+    matches = np.empty(CHUNK, dtype=np.bool_)
+
+    for chunk_start in range(0, 1 << 32, CHUNK):
+        np.add(offsets, np.uint32(chunk_start), out=states)
+        np.multiply(states, MULTIPLIER, out=states)
+        np.add(states, ADDEND, out=states)
+        np.right_shift(states, 16, out=outputs)
+        np.bitwise_and(outputs, 0x7FFF, out=outputs)
+        np.remainder(outputs, 100, out=outputs)
+        np.equal(outputs, nums[0], out=matches)
+
+        # Only about 1 in 100 seeds survives the first step, so the rest of the sequence is checked on small arrays
+        seeds = offsets[matches] + np.uint32(chunk_start)
+        candidates.append(filter_seeds(seeds, nums[1:], states[matches]))
+
+    return np.concatenate(candidates)
+
+
+def filter_seeds(seeds: np.ndarray, nums: list, states: np.ndarray = None) -> np.ndarray:
+    # Keep only the seeds that reproduce nums, starting from the given states (the seeds themselves by default)
+    if states is None:
+        states = seeds
+    for num in nums:
+        states = states * MULTIPLIER + ADDEND
+        matches = ((states >> 16) & 0x7FFF) % 100 == num
+        seeds = seeds[matches]
+        states = states[matches]
+    return seeds
+
+
+def predict_next(seed: int, n_nums: int) -> int:
+    # Run the generator forward from the seed past the n_nums known outputs and return the next one
+    state = seed
+    for _ in range(n_nums + 1):
+        state = (state * 214013 + 2531011) & 0xFFFFFFFF
+    return ((state >> 16) & 0x7FFF) % 100
+
+
+if __name__ == '__main__':
+    random_nums = [4, 54, 63, 79, 13, 55, 76, 11, 14, 45]
+
+    # The seeds that reproduce a longer prefix are a subset of the seeds that reproduce a shorter one,
+    # so we only go over all the possible seeds once and then narrow down the candidates
+    seeds = find_seeds(random_nums[:3])
+
+    for i in range(3, 10):
+        seeds = filter_seeds(seeds, random_nums[:i])
+        predictions = {predict_next(int(seed), i) for seed in seeds}
+        print(f'For the sequence: {random_nums[:i]}, found {len(seeds)} candidate seeds')
+        print(f'We were expecting: {random_nums[i]} and got: {predictions}\n')
@@ -5,19 +5,20 @@ def break_rand(nums: list, next_num: int):
     n_nums = len(nums)
     # print(f'len nums: {n_nums}')
 
-    states = {f'state_{i}': z.BitVec(f'state_{i}', 32) for i in range(1, n_nums + 2)}
+    # Notice: states[i - 1] holds state_i
+    states = [z.BitVec(f'state_{i}', 32) for i in range(1, n_nums + 2)]
     # print(states)
     output_next = z.BitVec('output_next', 32)
 
     s = z.Solver()
 
-    for i in range(2, n_nums + 2):
-        s.add(states[f'state_{i}'] == states[f'state_{i - 1}'] * 214013 + 2531011)
-
     for i in range(1, n_nums + 1):
-        s.add(z.URem((states[f'state_{i}'] >> 16) & 0x7FFF, 100) == nums[i - 1])
+        s.add(states[i] == states[i - 1] * 214013 + 2531011)
+
+    for i in range(n_nums):
+        s.add(z.URem((states[i] >> 16) & 0x7FFF, 100) == nums[i])
 
-    s.add(output_next == z.URem((states[f'state_{n_nums + 1}'] >> 16) & 0x7FFF, 100))
+    s.add(output_next == z.URem((states[n_nums] >> 16) & 0x7FFF, 100))
 
     # print(s)
 
@@ -38,20 +39,17 @@ def enumerate_solutions(nums: list, next_num: int, print_model: bool = False, pr
 
     while s.check() == z.sat:
         counter += 1
-        solution_list.append(s.model()[output_next].as_long())
+        model = s.model()
+        solution_list.append(model[output_next].as_long())
 
         print(f'Solution #{counter}')
         if print_model:
-            print(f'{s.model()}\n')
-
-        # Create constraints using string concatenation
-        or_expression = 'z.Or('
-        for i in states.keys():
-            if i == 'output_next': continue
-            or_expression += f'states[i] != s.model()[states[i]], '
-        or_expression += ')'
+            print(f'{model}\n')
 
-        s.add(eval(or_expression))
+        # Block the current model by requiring state_1 to differ from it
+        # Every other state is determined by state_1, so this blocks exactly the same solutions as requiring
+        # at least one of the states to differ
+        s.add(states[0] != model[states[0]])
 
     print(f'Found a total of {counter} solutions')
     if print_solutions:
@@ -1,31 +1,26 @@
 import asyncio
-from pyppeteer import launch
 
+import aiohttp
 
-async def get_cookie(url: str) -> int:
-    browser = await launch({'headless': True,
-                            'args': ['--no-sandbox', '--disable-setuid-sandbox'],
-                            'ignoreHTTPSErrors': True});
-    page = await browser.newPage()
 
-    await page.goto(url)
-    elementList = await page.querySelectorAll('form')
-    button = await elementList[0].querySelectorAll('input')
-    await button[0].click()
+async def get_cookie(session: aiohttp.ClientSession, action_url: str) -> int:
+    # The page only submits a form, so instead of clicking through it in a browser we send the POST ourselves
+    async with session.post(action_url, data={'BenchmarkTest00086': 'SafeText'}) as response:
+        # Notice: the session doesn't keep cookies, so we read the cookie from the response itself
+        return int(response.cookies['rememberMe00086'].value)
 
-    await page.waitForNavigation();
 
-    cookies = await page.cookies()
-
-    for cookie in cookies:
-        if cookie['name'] == 'rememberMe00086':
-            return int(cookie['value'])
+async def main(action_url: str, n_cookies: int) -> list:
+    # The benchmark uses a self signed certificate, so we skip certificate verification
+    # Notice: we don't keep any cookies between requests, otherwise the benchmark recognizes us as a returning user
+    # and doesn't set a new rememberMe00086 cookie
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False),
+                                     cookie_jar=aiohttp.DummyCookieJar()) as session:
+        return await asyncio.gather(*[get_cookie(session, action_url) for _ in range(n_cookies)])
 
 
 if __name__ == '__main__':
-    url = 'https://localhost:8443/benchmark/weakrand-00/BenchmarkTest00086?BenchmarkTest00086=SafeText'
+    action_url = 'https://localhost:8443/benchmark/weakrand-00/BenchmarkTest00086'
 
-    cookie_nums = []
-    for i in range(1):
-        cookie_nums.append(await get_cookie(url=url))
+    cookie_nums = asyncio.run(main(action_url=action_url, n_cookies=1))
     print(cookie_nums)
\ No newline at end of file